@@ -1,28 +1,46 @@
 # app/core/security.py
-from datetime import datetime, timedelta
+import base64
+import hashlib
+import time
+from datetime import timedelta
 from typing import Optional, Dict, Any
 
+import bcrypt
+from cachetools import TTLCache
 from passlib.context import CryptContext
-from jose import jwt, JWTError
+import jwt
+from jwt import InvalidTokenError as JWTError
+
+from app.config import settings
 
 # ---- Crypt / Hashing ----
-# Use bcrypt_sha256 to avoid bcrypt's 72-byte truncation issue.
-# If you need to verify old bcrypt-only hashes, include "bcrypt" second:
-# pwd_context = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
-pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
+# New hashes are plain bcrypt ($2b$...) over base64(sha256(password)), via the `bcrypt`
+# package directly: pre-hashing avoids bcrypt's 72-byte truncation, base64 avoids NUL bytes.
+# Cost comes from settings.BCRYPT_COST; login latency scales with 2^cost.
+#
+# Hashes written by the old passlib bcrypt_sha256 scheme ($bcrypt-sha256$...) use a
+# different pre-hash, so they are still verified through passlib.
+_LEGACY_PREFIX = "$bcrypt-sha256$"
+legacy_pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
+
+
+def _prehash(password: str) -> bytes:
+    return base64.b64encode(hashlib.sha256(password.encode()).digest())
 
 
 def hash_password(password: str) -> str:
     """
     Hash a password for storing in DB.
-    bcrypt_sha256 avoids the 72-byte limit of plain bcrypt.
     """
-    return pwd_context.hash(password)
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_COST)
+    return bcrypt.hashpw(_prehash(password), salt).decode()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plaintext password against a stored hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a plaintext password against a stored hash (constant-time compare)."""
+    if hashed_password.startswith(_LEGACY_PREFIX):
+        return legacy_pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(_prehash(plain_password), hashed_password.encode())
 
 
 # ---- JWT / Tokens ----
@@ -32,6 +50,16 @@ SECRET_KEY = "supersecretkeychangeinproduction"  # <-- replace with your real se
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# Built once rather than per encode/decode call
+_SECRET_KEY_BYTES = SECRET_KEY.encode()
+_ALGS = (ALGORITHM,)
+# Reject tokens missing these claims inside the decoder itself
+_DECODE_OPTIONS = {"require": ["exp", "sub"]}
+
+# Decoded payloads keyed by a sha256(token) prefix. Clients resend the same token on every
+# request, so most auth checks become a dict lookup instead of an HMAC verify + JSON parse.
+_jwt_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -40,26 +68,42 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     """
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        lifetime = int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        lifetime = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    # JWT `exp` is plain epoch seconds
+    to_encode["exp"] = int(time.time()) + lifetime
+    token = jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return token
 
 
+def _token_cache_key(token: str) -> bytes:
+    # hashlib's sha256 is OpenSSL's, which uses the CPU's SHA extensions where available
+    # (any OpenSSL >= 1.1.1 build). A 128-bit prefix is plenty for a cache key.
+    return hashlib.sha256(token.encode(), usedforsecurity=False).digest()[:16]
+
+
 def decode_access_token(token: str) -> Dict[str, Any]:
     """
     Decode a JWT access token and return payload.
     Raises JWTError on invalid/expired token (caller can handle).
+    Successful decodes are cached briefly (never past the token's own `exp`).
     """
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    key = _token_cache_key(token)
+    payload = _jwt_cache.get(key)
+    if payload is not None and payload["exp"] > time.time():
         return payload
-    except JWTError as e:
+
+    try:
+        payload = jwt.decode(token, _SECRET_KEY_BYTES, algorithms=_ALGS, options=_DECODE_OPTIONS)
+    except JWTError:
+        _jwt_cache.pop(key, None)
         # Re-raise so callers (dependencies) can convert to HTTPException appropriately
         raise
 
+    _jwt_cache[key] = payload
+    return payload
+
 
 # Optional helper that returns subject (user id) or None (not required, but often handy)
 def get_token_subject(token: str) -> Optional[str]:
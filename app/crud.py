@@ -48,7 +48,7 @@ async def get_reports_nearby(db: Session, lat: float, lon: float, radius_meters:
         select(Report)
         .where(
             func.ST_DWithin(
-                Report.location.cast(Geography),  # Ensure Report.location is cast too
+                Report.location_geog,  # stored geography column, GIST-indexed
                 user_location,
                 radius_meters
             )
@@ -5,14 +5,33 @@ from typing import AsyncGenerator
 from sqlmodel import SQLModel
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from sqlalchemy import text
 
 from app.config import settings  # keep your settings with DATABASE_URL
 
 # Async engine for asyncpg
+if settings.DB_USE_NULL_POOL:
+    pool_options = {"poolclass": NullPool}
+else:
+    pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+    }
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,
+    **pool_options,
+    connect_args={
+        # SQLAlchemy's asyncpg adapter cache + asyncpg's own statement cache
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "server_settings": settings.DB_SERVER_SETTINGS,
+    },
 )
 
 # Async session factory
@@ -21,13 +40,56 @@ async_session = sessionmaker(
 )
 
 
+# Report schema additions create_all() won't apply to an existing table.
+# Idempotent, so safe to run on every startup.
+REPORT_DDL = (
+    # Stored geography column (declared on the model) for tables created before it existed.
+    text("""
+        ALTER TABLE report ADD COLUMN IF NOT EXISTS location_geog geography(POINT, 4326)
+        GENERATED ALWAYS AS (location::geography) STORED
+    """),
+    # Superseded by the model's GIST index on location_geog
+    text("DROP INDEX IF EXISTS idx_report_location_geography"),
+    # Latest report per place: PARTITION BY place_name ORDER BY "timestamp" DESC
+    text("""
+        CREATE INDEX IF NOT EXISTS idx_report_place_ts
+        ON report (place_name, "timestamp" DESC)
+    """),
+)
+
+
+# Vibe indexes superseded by model-declared ones; run after create_missing_indexes()
+# so the replacement exists before the old index goes.
+VIBE_DDL = (
+    # Replaced by ix_vibe_user_timestamp_id, which adds id to match the keyset ORDER BY
+    text("DROP INDEX IF EXISTS ix_vibe_user_timestamp"),
+)
+
+
+def create_missing_indexes(sync_conn) -> None:
+    """
+    create_all() only builds indexes together with a new table; create any
+    model-declared index that an existing table is still missing.
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
 async def create_db_and_tables() -> None:
     """
-    Create tables (sync create_all invoked via run_sync with an async conn).
-    Also checks PostGIS presence.
+    Create tables (sync create_all invoked via run_sync with an async conn),
+    then the extra report DDL and any missing indexes. Also checks PostGIS presence.
     """
     async with engine.begin() as conn:
+        # gin_trgm_ops (trigram indexes for ILIKE search) must exist before create_all
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(SQLModel.metadata.create_all)
+        for ddl in REPORT_DDL:
+            await conn.execute(ddl)
+        await conn.run_sync(create_missing_indexes)
+        for ddl in VIBE_DDL:
+            await conn.execute(ddl)
         try:
             result = await conn.execute(text("SELECT PostGIS_Full_Version()"))
             print("PostGIS Version Check:", result.scalar_one_or_none())
@@ -39,3 +101,18 @@ async def create_db_and_tables() -> None:
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
+
+
+async def get_driver_connection(session: AsyncSession):
+    """
+    Return the raw asyncpg connection behind `session`, inside the session's current
+    transaction. Use for driver-only features such as COPY.
+    """
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    driver_conn = raw.driver_connection
+    # SQLAlchemy's asyncpg adapter only opens the asyncpg transaction on the first
+    # statement; run one so driver calls commit or roll back with the session.
+    if not driver_conn.is_in_transaction():
+        await session.execute(text("SELECT 1"))
+    return driver_conn
@@ -1,30 +1,65 @@
 # app/dependencies/auth_user.py
+from typing import NamedTuple
+
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session, select
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import decode_access_token
+from app.core.security import decode_access_token, JWTError
 from app.database import get_session
 from app.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)):
+class CurrentUser(NamedTuple):
+    """Immutable snapshot of the authenticated user; load the User row to change it."""
+    id: int
+    username: str
+    is_active: bool
+
+
+# Recently authenticated users keyed by username, so most requests skip the user SELECT.
+# Entries are shared across requests, hence immutable snapshots rather than ORM instances.
+# Drop entries with invalidate_cached_user() whenever a user changes.
+_user_cache: TTLCache = TTLCache(maxsize=5000, ttl=60)
+
+
+def invalidate_cached_user(username: str) -> None:
+    """Drop a user's cached snapshot; call after committing any change to that user."""
+    _user_cache.pop(username, None)
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)
+) -> CurrentUser:
     """
     Dependency that retrieves the current logged-in user from a JWT token.
     Raises 401 if the token is invalid or expired.
     """
-    payload = decode_access_token(token)
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired authentication token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise credentials_exception
     if not payload or "sub" not in payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired authentication token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise credentials_exception
 
     username = payload["sub"]
-    user = session.exec(select(User).where(User.username == username)).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = _user_cache.get(username)
+    if user is None:
+        result = await session.execute(
+            select(User.id, User.username, User.is_active).where(User.username == username)
+        )
+        row = result.first()
+        if not row:
+            raise HTTPException(status_code=404, detail="User not found")
+        user = CurrentUser(*row)
+        _user_cache[username] = user
 
     return user
@@ -1,10 +1,11 @@
 # main.py (root — the module you run with `uvicorn main:app`)
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from app.database import create_db_and_tables
+from app.database import create_db_and_tables, engine
 from app.routers import reports
 
 @asynccontextmanager
@@ -14,6 +15,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await create_db_and_tables()
     print("✅ Database tables and PostGIS geometry columns created successfully.")
     yield
+    await engine.dispose()  # close pooled connections cleanly
     print("Application shutdown complete.")
 
 
@@ -22,6 +24,7 @@ app = FastAPI(
     version="1.0.0",
     description="Backend for real-time, hyper-local crowd and status reporting.",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS if needed
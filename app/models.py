@@ -6,8 +6,8 @@ from typing import Optional, List
 from sqlmodel import Field, SQLModel, Column, Relationship
 # NOTE: Import String type for use in ARRAY below
 from sqlalchemy import String 
-from sqlalchemy import String, ForeignKey
-from geoalchemy2 import Geometry  # GeoAlchemy for PostGIS integration
+from sqlalchemy import String, ForeignKey, Computed, Index, func
+from geoalchemy2 import Geometry, Geography  # GeoAlchemy for PostGIS integration
 from sqlalchemy.dialects.postgresql import ARRAY  # For the list of Vibe Tags
 
 class Report(SQLModel, table=True):
@@ -21,6 +21,15 @@ class Report(SQLModel, table=True):
         sa_column=Column(Geometry(geometry_type='POINT', srid=4326, spatial_index=True)),
         description="Geographic point (Lat/Lon) where the report was taken."
     )
+    # Stored geography copy of `location`, kept in sync by Postgres. Radius/distance
+    # queries use it directly so they hit its GIST index instead of casting every row.
+    location_geog: Optional[Geography] = Field(
+        default=None,
+        sa_column=Column(
+            Geography(geometry_type='POINT', srid=4326, spatial_index=True),
+            Computed("location::geography", persisted=True),
+        ),
+    )
     
     # --- Vibe Data ---
     place_name: str = Field(index=True, max_length=100)
@@ -56,6 +65,18 @@ class User(SQLModel, table=True):
     vibes: List["Vibe"] = Relationship(back_populates="user")
 
 
+# Trigram indexes on lower(...) so the users search (lower(col) LIKE '%q%') can use
+# an index scan. Needs the pg_trgm extension (created in create_db_and_tables).
+Index(
+    "users_username_lower_trgm", func.lower(User.username).label("username_lower"),
+    postgresql_using="gin", postgresql_ops={"username_lower": "gin_trgm_ops"},
+)
+Index(
+    "users_email_lower_trgm", func.lower(User.email).label("email_lower"),
+    postgresql_using="gin", postgresql_ops={"email_lower": "gin_trgm_ops"},
+)
+
+
 # 🎵 Vibe Table
 class Vibe(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -79,6 +100,18 @@ class Vibe(SQLModel, table=True):
     model_config = {"arbitrary_types_allowed": True}
 
 
+# Trigram index for the vibes place filter (ILIKE '%place%').
+Index(
+    "vibe_place_name_trgm", Vibe.place_name,
+    postgresql_using="gin", postgresql_ops={"place_name": "gin_trgm_ops"},
+)
+
+# Keyset pages of vibes, newest first: both match list_vibes' ORDER BY timestamp DESC, id DESC
+# and its (timestamp, id) < cursor seek, with and without the user_id filter.
+Index("ix_vibe_user_timestamp_id", Vibe.user_id, Vibe.timestamp.desc(), Vibe.id.desc())
+Index("ix_vibe_timestamp_id", Vibe.timestamp.desc(), Vibe.id.desc())
+
+
 # 🖼 Media Table
 class VibeMedia(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
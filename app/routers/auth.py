@@ -4,12 +4,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from datetime import timedelta
+import asyncio
 import os
 import shutil
 from pathlib import Path
 import secrets
 
+from app.config import settings
 from app.database import get_session
+from app.dependencies.auth_user import invalidate_cached_user
 from app.models import User
 from app.schemas import UserCreate, UserRead, UserUpdate
 from app.core.security import (
@@ -24,6 +27,12 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 router = APIRouter(tags=["Auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Verified against when the username doesn't exist, so unknown and known users
+# take the same time to reject (no account enumeration via login timing).
+_DUMMY_HASH = hash_password("invalid")
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 
 # -------------------------------------------------
 # 🧍 REGISTER  (unchanged)
@@ -35,7 +44,8 @@ async def register_user(user_data: UserCreate, session: AsyncSession = Depends(g
     if existing_user:
         raise HTTPException(status_code=400, detail="Username already exists")
 
-    hashed_pw = hash_password(user_data.password)
+    # bcrypt is CPU-bound; keep it off the event loop
+    hashed_pw = await asyncio.to_thread(hash_password, user_data.password)
     new_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -63,7 +73,9 @@ async def register_user(user_data: UserCreate, session: AsyncSession = Depends(g
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_session)):
     result = await session.execute(select(User).where(User.username == form_data.username))
     user = result.scalars().first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+    pw_hash = user.password_hash if user else _DUMMY_HASH
+    password_ok = await asyncio.to_thread(verify_password, form_data.password, pw_hash)
+    if not user or not password_ok:
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
     token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -123,14 +135,23 @@ async def update_current_user_profile(
         safe_name = secrets.token_hex(12) + ext
         dest_path = upload_root / safe_name
 
-        # write file
+        # stream to disk in chunks so memory use doesn't grow with the upload size
+        written = 0
         try:
             with dest_path.open("wb") as f:
-                contents = await uploaded_file.read()
-                f.write(contents)
+                while chunk := await uploaded_file.read(UPLOAD_CHUNK_SIZE):
+                    written += len(chunk)
+                    if written > settings.MAX_AVATAR_BYTES:
+                        break
+                    f.write(chunk)
         except Exception as exc:
+            dest_path.unlink(missing_ok=True)
             raise HTTPException(status_code=500, detail=f"Failed to save uploaded file: {exc}")
 
+        if written > settings.MAX_AVATAR_BYTES:
+            dest_path.unlink(missing_ok=True)
+            raise HTTPException(status_code=413, detail="Avatar file is too large")
+
         # set avatar_url to a path the client can request (assumes StaticFiles mounted at /static)
         update_data["avatar_url"] = f"/static/uploads/{safe_name}"
 
@@ -145,5 +166,6 @@ async def update_current_user_profile(
     session.add(current_user)
     await session.commit()
     await session.refresh(current_user)
+    invalidate_cached_user(current_user.username)
 
     return current_user
@@ -1,19 +1,127 @@
-import json
-from typing import List
+import math
+from typing import List, Tuple
 
 from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from app.database import get_session
+from app.database import get_session, get_driver_connection
 from app.schemas import ReportCreate, ReportRead
 
 # ✅ Import the JWT helper to verify users
-from app.dependencies.auth_user import get_current_user
-from app.models import User
+from app.dependencies.auth_user import CurrentUser, get_current_user
 
 router = APIRouter()
 
+# ---------------------------------------------------------------------
+# SQL statements, built once at import and reused by every request
+# ---------------------------------------------------------------------
+INSERT_REPORT_SQL = text("""
+    INSERT INTO report (place_name, crowd_status, decibel_level, vibe_tags, user_id, location)
+    VALUES (:place_name, :crowd_status, :decibel_level, :vibe_tags, :user_id,
+            ST_SetSRID(ST_MakePoint(:lon, :lat), 4326))
+    RETURNING id, place_name, crowd_status, decibel_level, vibe_tags, user_id, "timestamp",
+              ST_Y(location::geometry) AS latitude,
+              ST_X(location::geometry) AS longitude;
+""")
+
+# Pick the latest report per place first, then compute distance only for
+# those winners (not for every superseded report in the radius).
+NEARBY_SQL = text("""
+    WITH in_radius AS (
+        SELECT
+            id,
+            place_name,
+            crowd_status,
+            decibel_level,
+            vibe_tags,
+            user_id,
+            "timestamp",
+            location,
+            location_geog,
+            row_number() OVER (PARTITION BY place_name ORDER BY "timestamp" DESC) AS rn
+        FROM report
+        -- cheap planar bbox test on the geometry GIST first; geodesic math only for survivors
+        WHERE location && ST_MakeEnvelope(:lon_min, :lat_min, :lon_max, :lat_max, 4326)
+          AND ST_DWithin(
+            location_geog,
+            ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography,
+            :radius_meters
+        )
+    )
+    SELECT
+        id,
+        place_name,
+        crowd_status,
+        decibel_level,
+        vibe_tags,
+        user_id,
+        "timestamp",
+        ST_Y(location::geometry) AS latitude,
+        ST_X(location::geometry) AS longitude,
+        ROUND((ST_Distance(
+            location_geog,
+            ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography
+        ) / 1000)::numeric, 2)::float8 AS distance_km
+    FROM in_radius
+    WHERE rn = 1
+    ORDER BY distance_km;
+""")
+
+# Bulk ingest: COPY rows into a per-transaction staging table, then build the
+# geometries and insert into report with a single INSERT ... SELECT.
+MAX_BULK_REPORTS = 1000
+BULK_STAGING_TABLE = "report_bulk_staging"
+BULK_STAGING_COLUMNS = ("place_name", "crowd_status", "decibel_level", "vibe_tags", "user_id", "lon", "lat")
+
+CREATE_BULK_STAGING_SQL = text(f"""
+    CREATE TEMP TABLE {BULK_STAGING_TABLE} (
+        place_name text,
+        crowd_status integer,
+        decibel_level double precision,
+        vibe_tags text[],
+        user_id text,
+        lon double precision,
+        lat double precision
+    ) ON COMMIT DROP
+""")
+
+INSERT_FROM_BULK_STAGING_SQL = text(f"""
+    INSERT INTO report (place_name, crowd_status, decibel_level, vibe_tags, user_id, location, "timestamp")
+    SELECT place_name, crowd_status, decibel_level, vibe_tags, user_id,
+           ST_SetSRID(ST_MakePoint(lon, lat), 4326),
+           timezone('utc', now())
+    FROM {BULK_STAGING_TABLE}
+    RETURNING id;
+""")
+
+DELETE_OWN_REPORT_SQL = text("DELETE FROM report WHERE id = :rid AND user_id = :uid RETURNING id")
+REPORT_EXISTS_SQL = text("SELECT 1 FROM report WHERE id = :rid")
+
+
+# Smallest WGS84 radius of curvature (meridional, at the equator). Using it overestimates
+# the angular radius slightly, so the box always contains everything ST_DWithin accepts.
+EARTH_RADIUS_MIN_M = 6_335_439.0
+
+
+def _bounding_box(lat: float, lon: float, radius_meters: float) -> Tuple[float, float, float, float]:
+    """
+    Lat/lon box (lat_min, lat_max, lon_min, lon_max) enclosing the circle of `radius_meters`
+    around (lat, lon). Widens to all longitudes when the circle covers a pole or crosses
+    the antimeridian, rather than splitting the box.
+    """
+    delta = radius_meters / EARTH_RADIUS_MIN_M  # angular radius, radians
+    lat_min = lat - math.degrees(delta)
+    lat_max = lat + math.degrees(delta)
+    if lat_min <= -90.0 or lat_max >= 90.0:
+        return max(lat_min, -90.0), min(lat_max, 90.0), -180.0, 180.0
+
+    dlon = math.degrees(math.asin(math.sin(delta) / math.cos(math.radians(lat))))
+    lon_min, lon_max = lon - dlon, lon + dlon
+    if lon_min < -180.0 or lon_max > 180.0:
+        lon_min, lon_max = -180.0, 180.0
+    return lat_min, lat_max, lon_min, lon_max
+
 
 # ---------------------------------------------------------------------
 # 🔐 POST - Submit a new Vibe Check Report (Authenticated)
@@ -22,7 +130,7 @@ router = APIRouter()
 async def submit_report(
     report: ReportCreate,
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),  # 👈 require valid token
+    current_user: CurrentUser = Depends(get_current_user),  # 👈 require valid token
 ):
     """
     Insert a new vibe check report with PostGIS point geometry and Postgres array (vibe_tags[]).
@@ -34,21 +142,12 @@ async def submit_report(
             "crowd_status": report.crowd_status,
             "decibel_level": report.decibel_level,
             "vibe_tags": report.vibe_tags,
-            "user_id": current_user.id,  # 👈 user_id comes from JWT
+            "user_id": str(current_user.id),  # 👈 user_id comes from JWT; report.user_id is VARCHAR
             "lon": report.lon,
             "lat": report.lat,
         }
 
-        insert_sql = text("""
-            INSERT INTO report (place_name, crowd_status, decibel_level, vibe_tags, user_id, location)
-            VALUES (:place_name, :crowd_status, :decibel_level, :vibe_tags, :user_id,
-                    ST_SetSRID(ST_MakePoint(:lon, :lat), 4326))
-            RETURNING id, place_name, crowd_status, decibel_level, vibe_tags, user_id, "timestamp",
-                      ST_Y(location::geometry) AS latitude,
-                      ST_X(location::geometry) AS longitude;
-        """)
-
-        result = await session.execute(insert_sql, params)
+        result = await session.execute(INSERT_REPORT_SQL, params)
         await session.commit()
 
         row = result.mappings().first()
@@ -74,6 +173,52 @@ async def submit_report(
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+# ---------------------------------------------------------------------
+# 📦 POST - Submit many reports at once (Authenticated)
+# ---------------------------------------------------------------------
+@router.post("/bulk", summary="Submit a batch of Vibe Check Reports")
+async def submit_reports_bulk(
+    reports: List[ReportCreate],
+    session: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Insert up to MAX_BULK_REPORTS reports in one round trip using Postgres COPY.
+    Only accessible to authenticated users; every row is attributed to the caller.
+    """
+    if not reports:
+        raise HTTPException(status_code=400, detail="No reports provided")
+    if len(reports) > MAX_BULK_REPORTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BULK_REPORTS} reports can be submitted at once",
+        )
+
+    try:
+        user_id = str(current_user.id)
+        records = [
+            (r.place_name, r.crowd_status, r.decibel_level, r.vibe_tags, user_id, r.lon, r.lat)
+            for r in reports
+        ]
+
+        await session.execute(CREATE_BULK_STAGING_SQL)
+        driver_conn = await get_driver_connection(session)
+        await driver_conn.copy_records_to_table(
+            BULK_STAGING_TABLE, records=records, columns=BULK_STAGING_COLUMNS
+        )
+        result = await session.execute(INSERT_FROM_BULK_STAGING_SQL)
+        ids = list(result.scalars().all())
+        await session.commit()
+
+        return {"status": "success", "count": len(ids), "ids": ids}
+
+    except HTTPException:
+        raise
+    except Exception as exc:
+        print(f"❌ Error bulk inserting reports: {exc}")
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
 # ---------------------------------------------------------------------
 # 🌍 GET - Retrieve Nearby Reports (Public)
 # ---------------------------------------------------------------------
@@ -89,56 +234,23 @@ async def get_nearby_reports(
     Public endpoint — no authentication required.
     """
     try:
-        query = text("""
-            SELECT DISTINCT ON (place_name)
-                id,
-                place_name,
-                crowd_status,
-                decibel_level,
-                vibe_tags,
-                user_id,
-                "timestamp",
-                ST_Y(location::geometry) AS latitude,
-                ST_X(location::geometry) AS longitude,
-                ST_Distance(
-                    location::geography,
-                    ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography
-                ) / 1000 AS distance_km
-            FROM report
-            WHERE ST_DWithin(
-                location::geography,
-                ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography,
-                :radius_meters
-            )
-            ORDER BY place_name, "timestamp" DESC;
-        """)
-
-        params = {"lon": lon, "lat": lat, "radius_meters": radius_km * 1000}
-        result = await session.execute(query, params)
+        radius_meters = radius_km * 1000
+        lat_min, lat_max, lon_min, lon_max = _bounding_box(lat, lon, radius_meters)
+        params = {
+            "lon": lon,
+            "lat": lat,
+            "radius_meters": radius_meters,
+            "lat_min": lat_min,
+            "lat_max": lat_max,
+            "lon_min": lon_min,
+            "lon_max": lon_max,
+        }
+        result = await session.execute(NEARBY_SQL, params)
         rows = result.mappings().all()
 
-        out = []
-        for r in rows:
-            vt = r["vibe_tags"]
-            if isinstance(vt, (str, bytes)):
-                try:
-                    vt = json.loads(vt)
-                except Exception:
-                    pass
-            out.append(
-                {
-                    "id": r["id"],
-                    "place_name": r["place_name"],
-                    "crowd_status": r["crowd_status"],
-                    "decibel_level": r["decibel_level"],
-                    "vibe_tags": vt,
-                    "user_id": r["user_id"],
-                    "timestamp": r["timestamp"],
-                    "latitude": r["latitude"],
-                    "longitude": r["longitude"],
-                    "distance_km": round(r["distance_km"], 2),
-                }
-            )
+        # Columns already come back in response shape: vibe_tags as a list (text[]),
+        # distance_km rounded by Postgres.
+        out = [dict(r) for r in rows]
 
         return {
             "status": "success",
@@ -158,28 +270,26 @@ async def get_nearby_reports(
 async def delete_report(
     report_id: int,
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Delete a report if it belongs to the current user.
     """
     try:
-        # 1️⃣ Fetch report owner
-        check_owner_sql = text("SELECT user_id FROM report WHERE id = :rid")
-        owner_result = await session.execute(check_owner_sql, {"rid": report_id})
-        owner_row = owner_result.mappings().first()
-
-        if not owner_row:
-            raise HTTPException(status_code=404, detail="Report not found")
+        # report.user_id is VARCHAR; asyncpg won't bind an int to a text parameter
+        user_id = str(current_user.id)
+        # Ownership check and delete in one statement (no SELECT-then-DELETE race)
+        result = await session.execute(DELETE_OWN_REPORT_SQL, {"rid": report_id, "uid": user_id})
+        deleted = result.first()
+        await session.commit()
 
-        if owner_row["user_id"] != current_user.id:
+        if not deleted:
+            # Nothing deleted: tell "missing" apart from "not yours"
+            exists = (await session.execute(REPORT_EXISTS_SQL, {"rid": report_id})).first()
+            if not exists:
+                raise HTTPException(status_code=404, detail="Report not found")
             raise HTTPException(status_code=403, detail="You can only delete your own reports")
 
-        # 2️⃣ Delete report
-        delete_sql = text("DELETE FROM report WHERE id = :rid")
-        await session.execute(delete_sql, {"rid": report_id})
-        await session.commit()
-
         return {"status": "success", "message": f"Report {report_id} deleted successfully"}
 
     except HTTPException:
@@ -1,40 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from sqlmodel import Session, select
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+from sqlmodel import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import raiseload, selectinload
+from typing import Optional
 
 from app.database import get_session
+from app.dependencies.auth_user import invalidate_cached_user
 from app.models import User
-from app.schemas import UserCreate, UserRead, UserUpdate
+from app.schemas import UserCreate, UserRead, UserUpdate, UserPage
 
 router = APIRouter(tags=["Users"])
 
 
 # -------------------------------------------------
-# 🧠 Helper: Convert relative avatar paths to full URLs
+# 🧾 List statements, built once; paging/search values are bound per request
 # -------------------------------------------------
-def build_avatar_url(request: Request, avatar_path: Optional[str]) -> Optional[str]:
-    """Convert stored relative avatar path to a full public URL."""
-    if not avatar_path:
-        return None
-
-    # If it's already a complete URL, return it as-is
-    if avatar_path.startswith("http"):
-        return avatar_path
-
-    # ✅ Use your ngrok domain if active, or fallback to request.base_url
-    base_url = "https://api.chetanbuilds.com"  # change to your active tunnel/domain
-    return f"{base_url}/static/uploads/{avatar_path.split('/')[-1]}"
+# Keyset pagination: WHERE id > :cursor ORDER BY id is an index seek on the primary
+# key, where OFFSET would scan and discard every skipped row.
+# Only the columns UserRead needs: never reads password_hash, and rows come back as
+# plain tuples instead of tracked ORM instances.
+USER_LIST_COLUMNS = (
+    User.id,
+    User.username,
+    User.email,
+    User.name,
+    User.avatar_url,
+    User.bio,
+    User.joined_at,
+    User.is_active,
+)
+LIST_USERS_STMT = (
+    select(*USER_LIST_COLUMNS)
+    .where(User.id > bindparam("cursor"))
+    .order_by(User.id)
+    .limit(bindparam("limit"))
+)
+# lower() LIKE rather than ILIKE: matches the lower(...) trigram indexes
+SEARCH_USERS_STMT = (
+    select(*USER_LIST_COLUMNS)
+    .where(
+        (func.lower(User.username).like(bindparam("pattern")))
+        | (func.lower(User.email).like(bindparam("pattern")))
+    )
+    .where(User.id > bindparam("cursor"))
+    .order_by(User.id)
+    .limit(bindparam("limit"))
+)
 
 
 # -------------------------------------------------
 # ✅ CREATE USER
 # -------------------------------------------------
 @router.post("/", response_model=UserRead)
-def create_user(user_data: UserCreate, session: Session = Depends(get_session), request: Request = None):
-    existing_user = session.exec(select(User).where(User.username == user_data.username)).first()
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Username already exists")
-
+async def create_user(user_data: UserCreate, session: AsyncSession = Depends(get_session)):
     new_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -43,51 +64,59 @@ def create_user(user_data: UserCreate, session: Session = Depends(get_session),
         avatar_url=user_data.avatar_url,
         bio=user_data.bio
     )
-    session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    # One atomic round trip: the unique indexes do the duplicate check
+    statement = (
+        pg_insert(User)
+        .values(**new_user.model_dump(exclude={"id"}))
+        .on_conflict_do_nothing()
+        .returning(User)
+    )
+    new_user = (await session.execute(statement)).scalars().first()
+    if new_user is None:
+        raise HTTPException(status_code=400, detail="Username or email already exists")
+    await session.commit()
 
-    # ✅ Attach full avatar URL for response
-    new_user.avatar_url = build_avatar_url(request, new_user.avatar_url)
     return new_user
 
 
 # -------------------------------------------------
 # ✅ READ USERS
 # -------------------------------------------------
-@router.get("/", response_model=List[UserRead])
-def list_users(
-    session: Session = Depends(get_session),
-    request: Request = None,
+@router.get("/", response_model=UserPage)
+async def list_users(
+    session: AsyncSession = Depends(get_session),
     search: Optional[str] = Query(None, description="Search by username or email"),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(20, le=100)
+    cursor: Optional[int] = Query(None, ge=0, description="next_cursor from the previous page"),
+    limit: int = Query(20, gt=0, le=100)
 ):
-    query = select(User)
+    # ids start at 1, so cursor 0 means "from the beginning"
+    params = {"cursor": cursor or 0, "limit": limit}
     if search:
-        query = query.where(
-            (User.username.ilike(f"%{search}%")) | (User.email.ilike(f"%{search}%"))
-        )
+        statement = SEARCH_USERS_STMT
+        params["pattern"] = f"%{search.lower()}%"
+    else:
+        statement = LIST_USERS_STMT
 
-    users = session.exec(query.offset(skip).limit(limit)).all()
+    users = (await session.execute(statement, params)).all()
+    # A short page means there is nothing after it
+    next_cursor = users[-1].id if len(users) == limit else None
 
-    # ✅ Add full avatar URL to each user
-    for u in users:
-        u.avatar_url = build_avatar_url(request, u.avatar_url)
-    return users
+    # ✅ Validate + serialize the whole page in one pydantic-core pass (UserRead builds
+    # the full avatar URL). Returning a Response skips FastAPI's own response_model
+    # pass; the response_model above is kept for the docs.
+    page = UserPage.model_validate({"items": users, "next_cursor": next_cursor}, from_attributes=True)
+    return Response(page.model_dump_json(), media_type="application/json")
 
 
 # -------------------------------------------------
 # ✅ READ SINGLE USER
 # -------------------------------------------------
 @router.get("/{user_id}", response_model=UserRead)
-def get_user(user_id: int, session: Session = Depends(get_session), request: Request = None):
-    user = session.get(User, user_id)
+async def get_user(user_id: int, session: AsyncSession = Depends(get_session)):
+    user = await session.get(User, user_id, options=[raiseload("*")])
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # ✅ Format avatar URL before returning
-    user.avatar_url = build_avatar_url(request, user.avatar_url)
     return user
 
 
@@ -95,29 +124,29 @@ def get_user(user_id: int, session: Session = Depends(get_session), request: Req
 # ✏️ UPDATE USER (partial update, fully safe)
 # -------------------------------------------------
 @router.put("/{user_id}", response_model=UserRead)
-def update_user(
+async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    session: Session = Depends(get_session),
-    request: Request = None,
+    session: AsyncSession = Depends(get_session),
 ):
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id, options=[raiseload("*")])
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    update_fields = user_data.dict(exclude_unset=True)
+    update_fields = user_data.model_dump(exclude_unset=True)
     if not update_fields:
         raise HTTPException(status_code=400, detail="No fields provided for update")
 
+    cached_username = user.username  # the cache key, in case username is being changed
     for key, value in update_fields.items():
         setattr(user, key, value)
 
-    session.add(user)
-    session.commit()
-    session.refresh(user)
+    # user is already tracked by the session, and only plain columns changed:
+    # no add() needed, and no refresh() round trip (expire_on_commit=False keeps values)
+    await session.commit()
+    # After the commit, so a concurrent request can't re-cache the old row
+    invalidate_cached_user(cached_username)
 
-    # ✅ Format avatar URL for frontend display
-    user.avatar_url = build_avatar_url(request, user.avatar_url)
     return user
 
 
@@ -125,11 +154,13 @@ def update_user(
 # 🗑 DELETE USER
 # -------------------------------------------------
 @router.delete("/{user_id}")
-def delete_user(user_id: int, session: Session = Depends(get_session)):
-    user = session.get(User, user_id)
+async def delete_user(user_id: int, session: AsyncSession = Depends(get_session)):
+    # Load vibes up front: the delete nulls their user_id, and lazy loads can't run under AsyncSession
+    user = await session.get(User, user_id, options=[selectinload(User.vibes)])
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    session.delete(user)
-    session.commit()
+    await session.delete(user)
+    await session.commit()
+    invalidate_cached_user(user.username)
     return {"status": "success", "message": f"User {user.username} deleted successfully"}
@@ -1,13 +1,21 @@
 # app/routers/vibes.py
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session, select
-from typing import List, Optional
+from fastapi.responses import Response
+from sqlmodel import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import DateTime, Integer, bindparam, tuple_
+from sqlalchemy.orm import raiseload, selectinload
+from datetime import datetime
+from itertools import product
+from typing import List, Optional, Tuple
 import random
 
-from app.database import get_session
-from app.models import Vibe, User
-from app.schemas import VibeCreate, VibeRead
-from app.dependencies.auth_user import get_current_user  # 🔐 import for ownership
+import orjson
+
+from app.database import get_session, get_driver_connection
+from app.models import Vibe
+from app.schemas import VibeCreate, VibeRead, VibePage
+from app.dependencies.auth_user import CurrentUser, get_current_user  # 🔐 import for ownership
 
 router = APIRouter(tags=["Vibes"])
 
@@ -21,19 +29,24 @@ MOCK_VIBES = [
 ]
 
 
+# Response bodies serialized once; /random just picks one
+MOCK_BYTES = [orjson.dumps({"status": "success", "vibe": vibe}) for vibe in MOCK_VIBES]
+_rng = random.Random()
+
+
 @router.get("/random", summary="Get a random demo vibe")
-def get_random_vibe():
-    return {"status": "success", "vibe": random.choice(MOCK_VIBES)}
+async def get_random_vibe():
+    return Response(MOCK_BYTES[_rng.randrange(len(MOCK_BYTES))], media_type="application/json")
 
 
 # -------------------------------------------------
 # ✅ CREATE (Authenticated)
 # -------------------------------------------------
 @router.post("/", response_model=VibeRead)
-def create_vibe(
+async def create_vibe(
     vibe_data: VibeCreate,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     vibe = Vibe(
         user_id=current_user.id,
@@ -43,41 +56,127 @@ def create_vibe(
         vibe_tags=vibe_data.vibe_tags,
     )
     session.add(vibe)
-    session.commit()
-    session.refresh(vibe)
+    await session.commit()
+    await session.refresh(vibe)
     return vibe
 
 
+# -------------------------------------------------
+# 📦 BULK CREATE (Authenticated)
+# -------------------------------------------------
+MAX_BULK_VIBES = 1000
+BULK_VIBE_COLUMNS = ("user_id", "place_name", "crowd_status", "decibel_level", "vibe_tags", "timestamp")
+
+
+@router.post("/bulk", summary="Create many vibes at once")
+async def create_vibes_bulk(
+    vibes: List[VibeCreate],
+    session: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Insert up to MAX_BULK_VIBES vibes in one round trip using Postgres COPY.
+    Every row is attributed to the caller, as in single create.
+    """
+    if not vibes:
+        raise HTTPException(status_code=400, detail="No vibes provided")
+    if len(vibes) > MAX_BULK_VIBES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BULK_VIBES} vibes can be submitted at once",
+        )
+
+    # COPY bypasses the model's default_factory, so stamp the batch here
+    now = datetime.utcnow()
+    records = [
+        (current_user.id, v.place_name, v.crowd_status, v.decibel_level, v.vibe_tags, now)
+        for v in vibes
+    ]
+    driver_conn = await get_driver_connection(session)
+    await driver_conn.copy_records_to_table(
+        Vibe.__tablename__, records=records, columns=BULK_VIBE_COLUMNS
+    )
+    await session.commit()
+    return {"status": "success", "count": len(records)}
+
+
 # -------------------------------------------------
 # 🔍 FILTER + PAGINATION
 # -------------------------------------------------
-@router.get("/", response_model=List[VibeRead])
-def list_vibes(
-    session: Session = Depends(get_session),
+def _list_vibes_statement(by_user: bool, by_place: bool, after_cursor: bool):
+    # raiseload: relationships are never serialized here; fail loudly instead of lazy-loading per row
+    statement = select(Vibe).options(raiseload("*"))
+    if by_user:
+        statement = statement.where(Vibe.user_id == bindparam("user_id"))
+    if by_place:
+        statement = statement.where(Vibe.place_name.ilike(bindparam("place")))
+    if after_cursor:
+        # Keyset pagination: seek past the last (timestamp, id) seen instead of OFFSET
+        statement = statement.where(
+            tuple_(Vibe.timestamp, Vibe.id)
+            < tuple_(bindparam("cursor_ts", type_=DateTime), bindparam("cursor_id", type_=Integer))
+        )
+    # Newest first; id breaks timestamp ties so pages are stable
+    statement = statement.order_by(Vibe.timestamp.desc(), Vibe.id.desc())
+    return statement.limit(bindparam("limit"))
+
+
+# One prebuilt statement per filter combination, keyed by (by_user, by_place, after_cursor)
+LIST_VIBES_STMTS = {
+    flags: _list_vibes_statement(*flags) for flags in product((False, True), repeat=3)
+}
+
+
+def _encode_vibe_cursor(vibe: Vibe) -> str:
+    return f"{vibe.timestamp.isoformat()}_{vibe.id}"
+
+
+def _decode_vibe_cursor(cursor: str) -> Tuple[datetime, int]:
+    ts, _, vibe_id = cursor.rpartition("_")
+    try:
+        return datetime.fromisoformat(ts), int(vibe_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/", response_model=VibePage)
+async def list_vibes(
+    session: AsyncSession = Depends(get_session),
     user_id: Optional[int] = Query(None),
     place: Optional[str] = Query(None),
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     limit: int = Query(10, gt=0, le=100),
 ):
-    query = select(Vibe)
+    params = {"limit": limit}
     if user_id:
-        query = query.where(Vibe.user_id == user_id)
+        params["user_id"] = user_id
     if place:
-        query = query.where(Vibe.place_name.ilike(f"%{place}%"))
-    return session.exec(query.offset(skip).limit(limit)).all()
+        params["place"] = f"%{place}%"
+    if cursor:
+        params["cursor_ts"], params["cursor_id"] = _decode_vibe_cursor(cursor)
+    statement = LIST_VIBES_STMTS[bool(user_id), bool(place), bool(cursor)]
+    vibes = (await session.execute(statement, params)).scalars().all()
+    # A short page means there is nothing after it
+    next_cursor = _encode_vibe_cursor(vibes[-1]) if len(vibes) == limit else None
+
+    # Validate + serialize the page in one pydantic-core pass, as list_users does.
+    # Returning a Response skips FastAPI's own response_model pass; the response_model
+    # above is kept for the docs.
+    page = VibePage.model_validate({"items": vibes, "next_cursor": next_cursor}, from_attributes=True)
+    return Response(page.model_dump_json(), media_type="application/json")
 
 
 # -------------------------------------------------
 # ✏️ UPDATE (Owner only)
 # -------------------------------------------------
 @router.put("/{vibe_id}", response_model=VibeRead)
-def update_vibe(
+async def update_vibe(
     vibe_id: int,
     vibe_data: VibeCreate,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    vibe = session.get(Vibe, vibe_id)
+    vibe = await session.get(Vibe, vibe_id, options=[raiseload("*")])
     if not vibe:
         raise HTTPException(status_code=404, detail="Vibe not found")
 
@@ -89,9 +188,9 @@ def update_vibe(
     vibe.crowd_status = vibe_data.crowd_status
     vibe.vibe_tags = vibe_data.vibe_tags
 
-    session.add(vibe)
-    session.commit()
-    session.refresh(vibe)
+    # vibe is already tracked by the session, and only plain columns changed:
+    # no add() needed, and no refresh() round trip (expire_on_commit=False keeps values)
+    await session.commit()
     return vibe
 
 
@@ -99,18 +198,21 @@ def update_vibe(
 # 🗑 DELETE (Owner only)
 # -------------------------------------------------
 @router.delete("/{vibe_id}")
-def delete_vibe(
+async def delete_vibe(
     vibe_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    vibe = session.get(Vibe, vibe_id)
+    # Load children up front: the delete nulls their vibe_id, and lazy loads can't run under AsyncSession
+    vibe = await session.get(
+        Vibe, vibe_id, options=[selectinload(Vibe.media), selectinload(Vibe.metrics)]
+    )
     if not vibe:
         raise HTTPException(status_code=404, detail="Vibe not found")
 
     if vibe.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="You can only delete your own vibes")
 
-    session.delete(vibe)
-    session.commit()
+    await session.delete(vibe)
+    await session.commit()
     return {"status": "success", "message": f"Vibe {vibe_id} deleted successfully"}
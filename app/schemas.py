@@ -1,9 +1,12 @@
 # app/schemas.py
+from functools import lru_cache
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 from datetime import datetime
 from sqlmodel import SQLModel
 
+from app.config import settings
+
 
 class ReportCreate(BaseModel):
     lat: float = Field(..., description="Latitude of the report location.")
@@ -26,9 +29,7 @@ class ReportRead(BaseModel):
     latitude: Optional[float] = None
     longitude: Optional[float] = None
 
-    model_config = {
-        "from_attributes": True
-    }
+    model_config = ConfigDict(from_attributes=True)
 
 # ============================================================
 # 🧍 USER SCHEMAS
@@ -46,13 +47,47 @@ class UserCreate(UserBase):
     password: str = Field(..., min_length=6)
 
 
-class UserRead(UserBase):
+# Public URL prefix for uploaded avatars, built once from settings
+UPLOAD_PREFIX = settings.PUBLIC_BASE_URL.rstrip("/") + "/static/uploads/"
+
+
+@lru_cache(maxsize=4096)
+def build_avatar_url(avatar_path: Optional[str]) -> Optional[str]:
+    """Convert stored relative avatar path to a full public URL."""
+    if not avatar_path:
+        return None
+
+    # If it's already a complete URL, return it as-is
+    if avatar_path.startswith("http"):
+        return avatar_path
+
+    return UPLOAD_PREFIX + avatar_path.rpartition("/")[2]
+
+
+class UserRead(BaseModel):
     id: int
+    username: str
+    email: Optional[str] = None
+    name: Optional[str] = None
+    bio: Optional[str] = None
     joined_at: datetime
     is_active: bool
+    # Stored (relative) path, read from the ORM's avatar_url column; not serialized.
+    avatar_path: Optional[str] = Field(default=None, validation_alias="avatar_url", exclude=True)
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @computed_field
+    @property
+    def avatar_url(self) -> Optional[str]:
+        """Full public avatar URL, built only when the response is serialized."""
+        return build_avatar_url(self.avatar_path)
 
-    class Config:
-        from_attributes = True
+
+class UserPage(BaseModel):
+    """One keyset page of users; pass next_cursor back as `cursor` for the next page."""
+    items: List[UserRead]
+    next_cursor: Optional[int] = None
 
 # IMPORTANT: make UserUpdate a regular Pydantic BaseModel so we can accept partial updates
 class UserUpdate(BaseModel):
@@ -80,11 +115,16 @@ class VibeCreate(VibeBase):
 
 class VibeRead(VibeBase):
     id: int
-    user_id: int
+    user_id: Optional[int] = None  # NULL once the author is deleted
     timestamp: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class VibePage(BaseModel):
+    """One keyset page of vibes; pass next_cursor back as `cursor` for the next page."""
+    items: List[VibeRead]
+    next_cursor: Optional[str] = None
 
 
 # ============================================================
@@ -106,8 +146,7 @@ class VibeMediaRead(VibeMediaBase):
     vibe_id: int
     uploaded_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============================================================
@@ -126,8 +165,7 @@ class VibeMetricsRead(VibeMetricsBase):
     vibe_id: int
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============================================================
@@ -143,8 +181,7 @@ class FollowerRead(FollowerBase):
     id: int
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============================================================
@@ -161,5 +198,4 @@ class SessionRead(SessionBase):
     created_at: datetime
     expires_at: Optional[datetime]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
@@ -8,7 +8,7 @@ from typing import Optional, List
 from sqlalchemy import String
 
 # Local imports from your app directory
-from app.database import engine
+from app.database import engine, REPORT_DDL, VIBE_DDL, create_missing_indexes
 # Import all models so SQLModel.metadata knows about them
 from app.models import Report 
 
@@ -25,10 +25,20 @@ async def create_db_and_tables():
         # We must run this DDL command explicitly before trying to create tables 
         # that use the 'geometry' type.
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis;"))
+        # pg_trgm provides gin_trgm_ops for the trigram search indexes on the models.
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
         
         # 2. Create the tables using SQLModel's metadata
         # This runs the synchronous DDL (CREATE TABLE) commands within an async transaction.
         await conn.run_sync(SQLModel.metadata.create_all)
+
+        # 3. Bring tables that already existed up to date: report columns/indexes
+        # create_all doesn't alter, plus any index declared on the models since.
+        for ddl in REPORT_DDL:
+            await conn.execute(ddl)
+        await conn.run_sync(create_missing_indexes)
+        for ddl in VIBE_DDL:
+            await conn.execute(ddl)
     
     print("Database initialization complete. Tables created successfully.")
 
@@ -1,6 +1,7 @@
 # main.py (root — the module you run with `uvicorn main:app`)
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
@@ -8,7 +9,7 @@ from typing import AsyncGenerator
 from fastapi.middleware.cors import CORSMiddleware
 
 # ✅ Import existing database init and routers
-from app.database import create_db_and_tables
+from app.database import create_db_and_tables, engine
 from app.routers import reports, users, vibes  # add new routers here
 from app.routers import reports, users, vibes, auth
 
@@ -29,6 +30,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await create_db_and_tables()  # ensure DB & PostGIS setup
     print("✅ Database tables and PostGIS geometry columns created successfully.")
     yield
+    await engine.dispose()  # close pooled connections cleanly
     print("Application shutdown complete.")
 
 
@@ -40,6 +42,7 @@ app = FastAPI(
     version="1.0.0",
     description="Backend for real-time, hyper-local crowd and status reporting.",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # =====================================================